@@ -11,10 +11,13 @@ Ximena Sarai Zelaya Salazar 20235973
 """
 
 import os
+import sys
 import json
+import time
+from collections import defaultdict
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from datetime import datetime
 from enum import Enum
 
@@ -48,17 +51,15 @@ class ConfigLoader:
     "Singleton para cargar configuraciones desde archivo JSON"
     _instance = None
     _config = None
+    _flat = None
 
-    "Controla que haya una sola instancia de la clase"
+    "Controla que haya una sola instancia de la clase y carga la configuración al crearla"
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(ConfigLoader, cls).__new__(cls)
+            cls._instance._load_config()
         return cls._instance
 
-    def __init__(self):
-        if self._config is None:
-            self._load_config()
-
     "Carga configuración desde config.json"
     def _load_config(self):
         default_config = {
@@ -90,20 +91,36 @@ class ConfigLoader:
             # Crear archivo config.json con configuración por defecto
             with open('config.json', 'w') as f:
                 json.dump(default_config, f, indent=2)
+        self._flat = {}
+        self._flatten(self._config, '')
+
+    "Indexa cada ruta con notación de punto (incluidas las intermedias) en un diccionario plano"
+    def _flatten(self, node: Dict[str, Any], prefix: str):
+        for key, value in node.items():
+            path = prefix + key
+            self._flat[path] = value
+            if isinstance(value, dict):
+                self._flatten(value, path + '.')
 
     "Obtiene un valor de configuración usando notación de punto"
     def get(self, key_path: str):
-        keys = key_path.split('.')
-        value = self._config
-        for key in keys:
-            value = value.get(key, {})
-        return value
+        return self._flat.get(key_path, {})
+
+
+"Instancia única de configuración, resuelta una sola vez al importar el módulo"
+CONFIG = ConfigLoader()
+
+# Tasas de bonificación por desempeño indexadas por el miembro del enum (no por su .value)
+_PERF_RATE_BY_TYPE: Dict[EmployeeType, float] = {
+    emp_type: CONFIG.get('payment.bonus.performance').get(emp_type.value, 0)
+    for emp_type in EmployeeType
+}
 
 
 # ==================== MODELOS DE DATOS ====================
 
 "Representa una transacción en el historial"
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     employee_name: str
     transaction_type: TransactionType
@@ -111,6 +128,13 @@ class Transaction:
     description: str
     date: datetime = field(default_factory=datetime.now)
 
+"Resultado de una solicitud de vacaciones"
+@dataclass(slots=True)
+class VacationResult:
+    success: bool
+    message: str
+    days_used: int = 0
+
 
 # ==================== ESTRATEGIAS DE PAGO (STRATEGY PATTERN) ====================
 
@@ -123,66 +147,62 @@ class PaymentStrategy(ABC):
 "Pago para empleados asalariados"
 class SalariedPaymentStrategy(PaymentStrategy):
     def calculate_payment(self, employee: 'Employee') -> float:
-        config = ConfigLoader()
-        base_salary = getattr(employee, 'monthly_salary', 
-                            config.get('payment.default_monthly_salary'))
-        return base_salary
+        return employee.monthly_salary
 
 "Pago para empleados por horas"
 class HourlyPaymentStrategy(PaymentStrategy):
     def calculate_payment(self, employee: 'Employee') -> float:
-        hourly_rate = getattr(employee, 'hourly_rate', 0)
-        hours = getattr(employee, 'hours_worked', 0)
-        return hourly_rate * hours
+        return employee.hourly_rate * employee.hours_worked
 
 "Estrategia de pago para freelancers"
 class FreelancerPaymentStrategy(PaymentStrategy):
     def calculate_payment(self, employee: 'Employee') -> float:
-        projects = getattr(employee, 'projects', [])
-        return sum(project.get('amount', 0) for project in projects)
+        return employee.projects_total
 
 
 # ==================== ESTRATEGIAS DE BONIFICACIÓN ====================
 
 "Estrategia abstracta para cálculo de bonificaciones"
 class BonusStrategy(ABC):
+    is_zero: bool = False  # True si la estrategia nunca otorga bonificación
+
     @abstractmethod
     def calculate_bonus(self, employee: 'Employee', base_payment: float) -> float:
         pass
 
 "Bonificación para empleados asalariados"
 class SalariedBonusStrategy(BonusStrategy):
+    _percentage = CONFIG.get('payment.bonus.salaried_percentage')
+
     def calculate_bonus(self, employee: 'Employee', base_payment: float) -> float:
-        config = ConfigLoader()
-        percentage = config.get('payment.bonus.salaried_percentage')
-        return base_payment * percentage
+        return base_payment * self._percentage
 
 "Bonificación para empleados por horas"
 class HourlyBonusStrategy(BonusStrategy):
+    def __init__(self, threshold: Optional[float] = None, amount: Optional[float] = None):
+        # Se resuelven una sola vez al construir la estrategia
+        self.threshold = CONFIG.get('payment.bonus.hourly_hours_threshold') if threshold is None else threshold
+        self.amount = CONFIG.get('payment.bonus.hourly_bonus_amount') if amount is None else amount
+
     def calculate_bonus(self, employee: 'Employee', base_payment: float) -> float:
-        config = ConfigLoader()
-        hours = getattr(employee, 'hours_worked', 0)
-        threshold = config.get('payment.bonus.hourly_hours_threshold')
-        bonus_amount = config.get('payment.bonus.hourly_bonus_amount')
-        
-        return bonus_amount if hours > threshold else 0
+        return self.amount if employee.hours_worked > self.threshold else 0
 
 
 "Sin bonificación (para pasantes y freelancers)"
 class NoBonus(BonusStrategy):
+    is_zero = True
+
     def calculate_bonus(self, employee: 'Employee', base_payment: float) -> float:
         return 0
 
 "Bonificación adicional por desempeño"
 class PerformanceBonusStrategy(BonusStrategy):
-    def calculate_bonus(self, employee: 'Employee', base_payment: float) -> float:
-        config = ConfigLoader()
-        performance_rates = config.get('payment.bonus.performance')
-
-        emp_type_key = employee.employee_type.value  # salaried, hourly, freelancer
-        performance_rate = performance_rates.get(emp_type_key, 0)
+    def __init__(self, rate: Optional[float] = None):
+        self.rate = rate  # None: se usa la tasa del tipo de contrato de cada empleado
 
-        return base_payment * performance_rate
+    def calculate_bonus(self, employee: 'Employee', base_payment: float) -> float:
+        rate = _PERF_RATE_BY_TYPE[employee.employee_type] if self.rate is None else self.rate
+        return base_payment * rate
 
 """Junta las clases, para poder dar bonos extra, "SalariedBonusStrategy", "HourlyBonusStrategy" y "PerformanceBonusStrategy" en una clase "CombinedBonusStrategy"""
 class CombinedBonusStrategy(BonusStrategy):
@@ -194,10 +214,22 @@ class CombinedBonusStrategy(BonusStrategy):
         return self.base_bonus.calculate_bonus(employee, base_payment) + \
                self.extra_bonus.calculate_bonus(employee, base_payment)
 
+"Bonificación base + desempeño, ambas proporcionales al pago, con las tasas ya resueltas"
+class LinearBonusStrategy(BonusStrategy):
+    def __init__(self, base_rate: float, performance_rate: float):
+        # Las tasas no se suman de antemano: base*a + base*b conserva los mismos montos
+        # que las estrategias por separado (0.10 + 0.05 no es exactamente 0.15 en float)
+        self.base_rate = base_rate
+        self.performance_rate = performance_rate
+
+    def calculate_bonus(self, employee: 'Employee', base_payment: float) -> float:
+        return base_payment * self.base_rate + base_payment * self.performance_rate
+
 # ==================== POLÍTICAS DE VACACIONES ====================
 
 "Política abstracta para manejo de vacaciones"
 class VacationPolicy(ABC):
+    _default_payout_days = CONFIG.get('vacation.payout_days')
 
     @abstractmethod
     def can_take_vacation(self, employee: 'Employee', days: int = 1) -> bool:
@@ -208,7 +240,7 @@ class VacationPolicy(ABC):
         pass
     
     @abstractmethod
-    def process_vacation(self, employee: 'Employee', payout: bool, days: int = None) -> str:
+    def process_vacation(self, employee: 'Employee', payout: bool, days: int = None) -> VacationResult:
         pass
 
 class InternVacationPolicy(VacationPolicy):
@@ -219,87 +251,139 @@ class InternVacationPolicy(VacationPolicy):
     def can_take_payout(self, employee: 'Employee', days: int) -> bool:
         return False
     
-    def process_vacation(self, employee: 'Employee', payout: bool, days: int = None) -> str:
-        return "Los pasantes no pueden solicitar vacaciones ni compensación monetaria."
+    def process_vacation(self, employee: 'Employee', payout: bool, days: int = None) -> VacationResult:
+        return VacationResult(False, "Los pasantes no pueden solicitar vacaciones ni compensación monetaria.")
 
 class ManagerVacationPolicy(VacationPolicy):
+    _max_payout = CONFIG.get('vacation.policies.manager.max_payout')
     
     def can_take_vacation(self, employee: 'Employee', days: int = 1) -> bool:
         return employee.vacation_days >= days
     
     def can_take_payout(self, employee: 'Employee', days: int) -> bool:
-        config = ConfigLoader()
-        max_payout = config.get('vacation.policies.manager.max_payout')
-        return employee.vacation_days >= days and days <= max_payout
+        return employee.vacation_days >= days and days <= self._max_payout
     
-    def process_vacation(self, employee: 'Employee', payout: bool, days: int = None) -> str:
+    def process_vacation(self, employee: 'Employee', payout: bool, days: int = None) -> VacationResult:
         if payout:
-            days = days or ConfigLoader().get('vacation.payout_days')
+            days = days or self._default_payout_days
             if self.can_take_payout(employee, days):
                 employee.vacation_days -= days
-                return f"Payout de {days} días procesado. Días restantes: {employee.vacation_days}"
+                return VacationResult(True, f"Payout de {days} días procesado. Días restantes: {employee.vacation_days}", days)
             else:
-                return f"No se puede procesar el payout. Días disponibles: {employee.vacation_days}"
+                return VacationResult(False, f"No se puede procesar el payout. Días disponibles: {employee.vacation_days}")
         else:
             if self.can_take_vacation(employee, 1):
                 employee.vacation_days -= 1
-                return f"Vacación procesada. Días restantes: {employee.vacation_days}"
+                return VacationResult(True, f"Vacación procesada. Días restantes: {employee.vacation_days}", 1)
             else:
-                return "No hay suficientes días de vacaciones disponibles."
+                return VacationResult(False, "No hay suficientes días de vacaciones disponibles.")
 
 class VicePresidentVacationPolicy(VacationPolicy):
+    _max_per_request = CONFIG.get('vacation.policies.vice_president.max_per_request')
     
     def can_take_vacation(self, employee: 'Employee', days: int = 1) -> bool:
-        config = ConfigLoader()
-        max_per_request = config.get('vacation.policies.vice_president.max_per_request')
-        return days <= max_per_request  # Vacaciones ilimitadas pero máximo 5 por solicitud
+        return days <= self._max_per_request  # Vacaciones ilimitadas pero máximo 5 por solicitud
     
     def can_take_payout(self, employee: 'Employee', days: int) -> bool:
         return employee.vacation_days >= days
     
-    def process_vacation(self, employee: 'Employee', payout: bool, days: int = None) -> str:
+    def process_vacation(self, employee: 'Employee', payout: bool, days: int = None) -> VacationResult:
         if payout:
-            days = days or ConfigLoader().get('vacation.payout_days')
+            days = days or self._default_payout_days
             if self.can_take_payout(employee, days):
                 employee.vacation_days -= days
-                return f"Payout de {days} días procesado. Días restantes: {employee.vacation_days}"
+                return VacationResult(True, f"Payout de {days} días procesado. Días restantes: {employee.vacation_days}", days)
             else:
-                return f"No se puede procesar el payout. Días disponibles: {employee.vacation_days}"
+                return VacationResult(False, f"No se puede procesar el payout. Días disponibles: {employee.vacation_days}")
         else:
             if self.can_take_vacation(employee, 1):
                 employee.vacation_days -= 1
-                return f"Vacación procesada. Días restantes: {employee.vacation_days}"
+                return VacationResult(True, f"Vacación procesada. Días restantes: {employee.vacation_days}", 1)
             else:
-                return "Máximo 5 días por solicitud para vicepresidentes."
+                return VacationResult(False, "Máximo 5 días por solicitud para vicepresidentes.")
 
 class DeveloperVacationPolicy(VacationPolicy):
+    _max_per_request = CONFIG.get('vacation.policies.developer.max_per_request')
+    _max_payout = CONFIG.get('vacation.policies.developer.max_payout')
 
     def can_take_vacation(self, employee: 'Employee', days: int = 1) -> bool:
-        config = ConfigLoader()
-        max_per_request = config.get('vacation.policies.developer.max_per_request')
-        return employee.vacation_days >= days and days <= max_per_request
+        return employee.vacation_days >= days and days <= self._max_per_request
 
     def can_take_payout(self, employee: 'Employee', days: int) -> bool:
-        config = ConfigLoader()
-        max_payout = config.get('vacation.policies.developer.max_payout')
-        return employee.vacation_days >= days and days <= max_payout
+        return employee.vacation_days >= days and days <= self._max_payout
 
-    def process_vacation(self, employee: 'Employee', payout: bool, days: int = None) -> str:
-        config = ConfigLoader()
+    def process_vacation(self, employee: 'Employee', payout: bool, days: int = None) -> VacationResult:
         if payout:
-            days = days or config.get('vacation.payout_days')
+            days = days or self._default_payout_days
             if self.can_take_payout(employee, days):
                 employee.vacation_days -= days
-                return f"Payout de {days} días procesado. Días restantes: {employee.vacation_days}"
+                return VacationResult(True, f"Payout de {days} días procesado. Días restantes: {employee.vacation_days}", days)
             else:
-                return f"No se puede procesar el payout. Días disponibles: {employee.vacation_days}"
+                return VacationResult(False, f"No se puede procesar el payout. Días disponibles: {employee.vacation_days}")
         else:
             days = days or 1
             if self.can_take_vacation(employee, days):
                 employee.vacation_days -= days
-                return f"Vacación de {days} días procesada. Días restantes: {employee.vacation_days}"
+                return VacationResult(True, f"Vacación de {days} días procesada. Días restantes: {employee.vacation_days}", days)
             else:
-                return "No cumple con los requisitos para la solicitud de vacaciones."
+                return VacationResult(False, "No cumple con los requisitos para la solicitud de vacaciones.")
+
+# ==================== TABLAS DE DESPACHO (FLYWEIGHT) ====================
+
+# Las estrategias y políticas no guardan estado por empleado, así que una
+# sola instancia de cada una se comparte entre todos los empleados.
+
+# Estrategia de pago según el tipo de contrato
+_PAYMENT_STRATEGIES: Dict[EmployeeType, PaymentStrategy] = {
+    EmployeeType.SALARIED: SalariedPaymentStrategy(),
+    EmployeeType.HOURLY: HourlyPaymentStrategy(),
+    EmployeeType.FREELANCER: FreelancerPaymentStrategy(),
+}
+
+# Estrategia de bonificación según el tipo de contrato
+_BONUS_STRATEGIES: Dict[EmployeeType, BonusStrategy] = {
+    # Asalariado: porcentaje base + desempeño, ambos proporcionales al salario
+    EmployeeType.SALARIED: LinearBonusStrategy(
+        SalariedBonusStrategy._percentage,
+        _PERF_RATE_BY_TYPE[EmployeeType.SALARIED]
+    ),
+    EmployeeType.HOURLY: CombinedBonusStrategy(
+        HourlyBonusStrategy(),
+        PerformanceBonusStrategy(_PERF_RATE_BY_TYPE[EmployeeType.HOURLY])
+    ),
+    EmployeeType.FREELANCER: PerformanceBonusStrategy(_PERF_RATE_BY_TYPE[EmployeeType.FREELANCER]),
+}
+
+# Política de vacaciones según el rol
+_VACATION_POLICIES: Dict[EmployeeRole, VacationPolicy] = {
+    EmployeeRole.INTERN: InternVacationPolicy(),
+    EmployeeRole.MANAGER: ManagerVacationPolicy(),
+    EmployeeRole.VICE_PRESIDENT: VicePresidentVacationPolicy(),
+    EmployeeRole.DEVELOPER: DeveloperVacationPolicy(),
+}
+
+_NO_BONUS = NoBonus()
+
+"Copia los datos de pago de un asalariado desde los argumentos del factory"
+def _apply_salaried_data(employee: 'Employee', kwargs: Dict[str, Any]) -> None:
+    employee.monthly_salary = kwargs.get('monthly_salary', CONFIG.get('payment.default_monthly_salary'))
+
+"Copia los datos de pago de un empleado por horas desde los argumentos del factory"
+def _apply_hourly_data(employee: 'Employee', kwargs: Dict[str, Any]) -> None:
+    employee.hourly_rate = kwargs.get('hourly_rate', CONFIG.get('payment.default_hourly_rate'))
+    employee.hours_worked = kwargs.get('hours_worked', 0)
+
+"Copia los proyectos de un freelancer desde los argumentos del factory"
+def _apply_freelancer_data(employee: 'Employee', kwargs: Dict[str, Any]) -> None:
+    employee.set_projects(kwargs.get('projects', []))
+
+# Asignación de datos de pago según el tipo de contrato
+_PAYMENT_DATA_BUILDERS: Dict[EmployeeType, Callable[['Employee', Dict[str, Any]], None]] = {
+    EmployeeType.SALARIED: _apply_salaried_data,
+    EmployeeType.HOURLY: _apply_hourly_data,
+    EmployeeType.FREELANCER: _apply_freelancer_data,
+}
+
 
 # ==================== FACTORY PARA EMPLEADOS ====================
 
@@ -309,11 +393,9 @@ class EmployeeFactory:
     @staticmethod
     def create_employee(name: str, role: EmployeeRole, emp_type: EmployeeType, **kwargs) -> 'Employee':
         """Crea un empleado con las estrategias apropiadas"""
-        config = ConfigLoader()
-
         # Crear empleado base
         vac_days = 0 if role == EmployeeRole.INTERN or emp_type == EmployeeType.FREELANCER \
-            else config.get('vacation.default_days')
+            else CONFIG.get('vacation.default_days')
 
         employee = Employee(
             name=name,
@@ -321,51 +403,31 @@ class EmployeeFactory:
             vacation_days=vac_days
         )
 
-        # Asignar estrategias según el tipo
-        if emp_type == EmployeeType.SALARIED:
-            employee.monthly_salary = kwargs.get('monthly_salary', config.get('payment.default_monthly_salary'))
-            payment_strategy = SalariedPaymentStrategy()
-            base_bonus = SalariedBonusStrategy()
-            perf_bonus = PerformanceBonusStrategy()
-            bonus_strategy = CombinedBonusStrategy(base_bonus, perf_bonus)
-
-        elif emp_type == EmployeeType.HOURLY:
-            employee.hourly_rate = kwargs.get('hourly_rate', config.get('payment.default_hourly_rate'))
-            employee.hours_worked = kwargs.get('hours_worked', 0)
-            payment_strategy = HourlyPaymentStrategy()
-            base_bonus = HourlyBonusStrategy()
-            perf_bonus = PerformanceBonusStrategy()
-            bonus_strategy = CombinedBonusStrategy(base_bonus, perf_bonus)
-
-        elif emp_type == EmployeeType.FREELANCER:
-            employee.projects = kwargs.get('projects', [])
-            payment_strategy = FreelancerPaymentStrategy()
-            bonus_strategy = PerformanceBonusStrategy()
-
-        # Asignar estrategias
-        employee.payment_strategy = payment_strategy
-        employee.bonus_strategy = bonus_strategy
-
-        # Asignar política de vacaciones según el rol
-        if role == EmployeeRole.INTERN:
-            employee.vacation_policy = InternVacationPolicy()
-            employee.bonus_strategy = NoBonus()  # Los pasantes no reciben bonos
+        # Asignar datos de pago según el tipo
+        _PAYMENT_DATA_BUILDERS[emp_type](employee, kwargs)
 
-        elif role == EmployeeRole.MANAGER:
-            employee.vacation_policy = ManagerVacationPolicy()
+        # Asignar estrategias compartidas
+        employee.payment_strategy = _PAYMENT_STRATEGIES[emp_type]
+        employee.bonus_strategy = _BONUS_STRATEGIES[emp_type]
+        employee.vacation_policy = _VACATION_POLICIES[role]
 
-        elif role == EmployeeRole.VICE_PRESIDENT:
-            employee.vacation_policy = VicePresidentVacationPolicy()
-        elif role == EmployeeRole.DEVELOPER:
-            employee.vacation_policy = DeveloperVacationPolicy()
+        if role == EmployeeRole.INTERN:
+            employee.bonus_strategy = _NO_BONUS  # Los pasantes no reciben bonos
 
         employee.employee_type = emp_type
         return employee
 
+    @staticmethod
+    def create_employees_bulk(records: List[Dict[str, Any]]) -> List['Employee']:
+        """Crea varios empleados a partir de registros con las claves name, role, emp_type
+        y los datos de pago opcionales; todos comparten las mismas instancias de estrategias"""
+        create = EmployeeFactory.create_employee
+        return [create(**record) for record in records]
+
 
 # ==================== MODELO EMPLOYEE REFACTORIZADO ====================
 
-@dataclass
+@dataclass(slots=True)
 class Employee:
     "Empleado con estrategias inyectadas"
     name: str
@@ -375,6 +437,28 @@ class Employee:
     bonus_strategy: BonusStrategy = None
     vacation_policy: VacationPolicy = None
     employee_type: EmployeeType = None
+    # Datos de pago; cada tipo de contrato usa solo los suyos
+    monthly_salary: float = field(default_factory=lambda: CONFIG.get('payment.default_monthly_salary'))
+    hourly_rate: float = 0
+    hours_worked: int = 0
+    # Proyectos de freelancer: solo cambian con set_projects, así el total guardado no queda desfasado
+    _projects: Tuple[Dict[str, Any], ...] = field(init=False, default=())
+    _projects_total: float = field(init=False, default=0)
+    
+    @property
+    def projects(self) -> Tuple[Dict[str, Any], ...]:
+        "Copia de solo lectura de los proyectos; para modificarlos usar set_projects"
+        return tuple(dict(project) for project in self._projects)
+    
+    @property
+    def projects_total(self) -> float:
+        "Monto total de los proyectos, calculado al asignarlos"
+        return self._projects_total
+    
+    def set_projects(self, projects: List[Dict[str, Any]]) -> None:
+        "Reemplaza los proyectos con una copia propia y recalcula su monto total"
+        self._projects = tuple(dict(project) for project in projects)
+        self._projects_total = sum(project.get('amount', 0) for project in self._projects)
     
     def calculate_payment(self) -> float:
         "Calcula el pago base usando la estrategia asignada"
@@ -385,11 +469,19 @@ class Employee:
         base_payment = self.calculate_payment()
         return self.bonus_strategy.calculate_bonus(self, base_payment)
     
+    def calculate_payment_and_bonus(self) -> Tuple[float, float]:
+        "Calcula el pago base una sola vez y la bonificación sobre ese mismo pago"
+        base_payment = self.payment_strategy.calculate_payment(self)
+        if self.bonus_strategy.is_zero:
+            return base_payment, 0
+        return base_payment, self.bonus_strategy.calculate_bonus(self, base_payment)
+    
     def calculate_total_payment(self) -> float:
         "Calcula el pago total incluyendo bonificaciones"
-        return self.calculate_payment() + self.calculate_bonus()
+        base_payment, bonus = self.calculate_payment_and_bonus()
+        return base_payment + bonus
     
-    def request_vacation(self, payout: bool = False, days: int = None) -> str:
+    def request_vacation(self, payout: bool = False, days: int = None) -> VacationResult:
         "Solicita vacaciones usando la política asignada"
         return self.vacation_policy.process_vacation(self, payout, days)
 
@@ -406,76 +498,100 @@ class Command(ABC):
 "Comando para pagar a un empleado"
 class PayEmployeeCommand(Command):
     
-    def __init__(self, employee: Employee, transaction_history: List[Transaction]):
+    def __init__(self, employee: Employee, record_transactions: Callable[[List[Transaction]], None],
+                 now: Optional[datetime] = None):
         self.employee = employee
-        self.transaction_history = transaction_history
+        self.record_transactions = record_transactions  # p. ej. Company.record_transactions
+        self.now = now  # Fecha compartida por todas las transacciones de un lote
     
     def execute(self) -> str:
-        total_payment = self.employee.calculate_total_payment()
-        bonus = self.employee.calculate_bonus()
+        base_payment, bonus = self.employee.calculate_payment_and_bonus()
+        total_payment = base_payment + bonus
+        date = self.now or datetime.now()
         
-        # Registrar transacción de pago
-        payment_transaction = Transaction(
+        # Transacción de pago
+        transactions = [Transaction(
             employee_name=self.employee.name,
             transaction_type=TransactionType.PAYMENT,
             amount=total_payment,
-            description=f"Pago total: ${total_payment:.2f}"
-        )
-        self.transaction_history.append(payment_transaction)
+            description=f"Pago total: ${total_payment:.2f}",
+            date=date
+        )]
         
-        # Registrar bonificación si aplica
+        # Bonificación si aplica
         if bonus > 0:
-            bonus_transaction = Transaction(
+            transactions.append(Transaction(
                 employee_name=self.employee.name,
                 transaction_type=TransactionType.BONUS,
                 amount=bonus,
-                description=f"Bonificación: ${bonus:.2f}"
-            )
-            self.transaction_history.append(bonus_transaction)
+                description=f"Bonificación: ${bonus:.2f}",
+                date=date
+            ))
+        
+        # Registrar ambas en el historial con una sola operación
+        self.record_transactions(transactions)
         
         return f"Pagando a {self.employee.name}: ${total_payment:.2f} (incluye bonificación: ${bonus:.2f})"
 
 "Comando para procesar vacaciones"
 class VacationCommand(Command):
     
-    def __init__(self, employee: Employee, payout: bool, transaction_history: List[Transaction], days: int = None):
+    def __init__(self, employee: Employee, payout: bool, record_transactions: Callable[[List[Transaction]], None],
+                 days: int = None, now: Optional[datetime] = None):
         self.employee = employee
         self.payout = payout
-        self.transaction_history = transaction_history
+        self.record_transactions = record_transactions
         self.days = days
+        self.now = now
     
     def execute(self) -> str:
         result = self.employee.request_vacation(self.payout, self.days)
         
         # Registrar transacción si fue exitosa
-        if "procesado" in result or "procesada" in result:
+        if result.success:
             transaction_type = TransactionType.VACATION_PAYOUT if self.payout else TransactionType.VACATION
-            days_used = self.days or (ConfigLoader().get('vacation.payout_days') if self.payout else 1)
             
             transaction = Transaction(
                 employee_name=self.employee.name,
                 transaction_type=transaction_type,
-                amount=days_used,
-                description=result
+                amount=result.days_used,
+                description=result.message,
+                date=self.now or datetime.now()
             )
-            self.transaction_history.append(transaction)
+            self.record_transactions([transaction])
         
-        return result
+        return result.message
 
 
 # ==================== DECORADOR PARA LOGGING ====================
 
 "Decorador para agregar logging a operaciones"
 class LoggingDecorator:
+    # Marca de tiempo formateada del último segundo registrado, compartida entre instancias
+    _last_ts_second: int = -1
+    _last_ts_str: str = ""
     
-    def __init__(self, command: Command):
+    def __init__(self, command: Command, log_buffer: Optional[List[str]] = None):
         self.command = command
+        self.log_buffer = log_buffer  # Si se indica, las líneas se acumulan en vez de imprimirse
     
     def execute(self) -> Any:
         result = self.command.execute()
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[LOG {timestamp}] {result}")
+        line = f"[LOG {self._timestamp()}] {result}"
+        if self.log_buffer is None:
+            print(line)
+        else:
+            self.log_buffer.append(line)
         return result
+    
+    @classmethod
+    def _timestamp(cls) -> str:
+        "Formatea la hora actual solo cuando cambia el segundo"
+        second = int(time.time())
+        if second != cls._last_ts_second:
+            cls._last_ts_second = second
+            cls._last_ts_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+        return cls._last_ts_str
 
 
 # ==================== COMPANY REFACTORIZADA ====================
@@ -484,16 +600,32 @@ class LoggingDecorator:
 class Company:
     
     def __init__(self):
-        self.employees: List[Employee] = []
+        # Solo se modifica con add_employee para que el índice por rol no quede desfasado
+        self._employees: List[Employee] = []
         self.transaction_history: List[Transaction] = []
+        # Índice por nombre de empleado; se mantiene con record_transaction/record_transactions
+        self._history_by_name: Dict[str, List[Transaction]] = defaultdict(list)
+        self._employees_by_role: Dict[EmployeeRole, List[Employee]] = {role: [] for role in EmployeeRole}
+    
+    @property
+    def employees(self) -> Tuple[Employee, ...]:
+        "Empleados de la compañía (solo lectura; para agregar usar add_employee)"
+        return tuple(self._employees)
     
     def add_employee(self, employee: Employee) -> None:
         "Agrega un empleado a la compañía"
-        self.employees.append(employee)
+        self._employees.append(employee)
+        self._employees_by_role[employee.role].append(employee)
+    
+    def change_employee_role(self, employee: Employee, role: EmployeeRole) -> None:
+        "Cambia el rol de un empleado y lo mueve al grupo correspondiente del índice por rol"
+        self._employees_by_role[employee.role].remove(employee)
+        employee.role = role
+        self._employees_by_role[role].append(employee)
     
     def find_employees_by_role(self, role: EmployeeRole) -> List[Employee]:
         "Encuentra empleados por rol (método genérico)"
-        return [emp for emp in self.employees if emp.role == role]
+        return list(self._employees_by_role[role])
     
     def find_managers(self) -> List[Employee]:
         "Encuentra gerentes"
@@ -507,63 +639,114 @@ class Company:
         "Encuentra vicepresidentes"
         return self.find_employees_by_role(EmployeeRole.VICE_PRESIDENT)
     
+    def record_transaction(self, transaction: Transaction) -> None:
+        "Registra una transacción en el historial y en el índice de su empleado"
+        self.transaction_history.append(transaction)
+        self._history_by_name[transaction.employee_name].append(transaction)
+    
+    def record_transactions(self, transactions: List[Transaction]) -> None:
+        "Registra varias transacciones de una vez"
+        self.transaction_history.extend(transactions)
+        for transaction in transactions:
+            self._history_by_name[transaction.employee_name].append(transaction)
+    
     def pay_employee(self, employee: Employee) -> str:
         "Paga a un empleado usando Command pattern"
-        command = PayEmployeeCommand(employee, self.transaction_history)
+        command = PayEmployeeCommand(employee, self.record_transactions)
         logged_command = LoggingDecorator(command)
         return logged_command.execute()
     
     def pay_all_employees(self) -> None:
-        "Paga a todos los empleados"
-        for employee in self.employees:
-            self.pay_employee(employee)
+        "Paga a todos los empleados y escribe el log de toda la nómina de una sola vez"
+        log_buffer: List[str] = []
+        now = datetime.now()
+        try:
+            for employee in self._employees:
+                command = PayEmployeeCommand(employee, self.record_transactions, now)
+                LoggingDecorator(command, log_buffer).execute()
+        finally:
+            if log_buffer:
+                sys.stdout.write('\n'.join(log_buffer) + '\n')
     
     def process_vacation(self, employee: Employee, payout: bool = False, days: int = None) -> str:
         "Procesa vacaciones"
-        command = VacationCommand(employee, payout, self.transaction_history, days)
+        command = VacationCommand(employee, payout, self.record_transactions, days)
         logged_command = LoggingDecorator(command)
         return logged_command.execute()
     
     def get_employee_history(self, employee_name: str) -> List[Transaction]:
         "Obtiene el historial de transacciones de un empleado"
-        return [t for t in self.transaction_history if t.employee_name == employee_name]
+        return list(self._history_by_name.get(employee_name, ()))
 
 
 # ==================== INTERFAZ DE USUARIO ====================
 
 "Interfaz de usuario separada de la lógica de negocio"
 class EmployeeManagementUI:
+    _ROLES = list(EmployeeRole)
+    _TYPES = list(EmployeeType)
+    # Menús armados una sola vez para imprimirlos con una única escritura
+    _MAIN_MENU = "\n".join([
+        "--- Employee Management Menu ---",
+        "1. Create employee",
+        "2. View employees",
+        "3. Grant vacation to an employee",
+        "4. Pay employees",
+        "5. View employee history",
+        "6. Exit",
+    ])
+    _VIEW_EMPLOYEES_MENU = "\n".join([
+        "--- View Employees Submenu ---",
+        "1. View managers",
+        "2. View interns",
+        "3. View vice presidents",
+        "4. View all employees",
+        "0. Return to main menu",
+    ])
     
     def __init__(self):
         self.company = Company()
+        if os.name == 'nt':
+            os.system('')  # Habilita las secuencias ANSI en la consola de Windows
     
     def clear_screen(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
+        # Secuencia ANSI: cursor al inicio y borrar pantalla, sin lanzar un proceso externo
+        sys.stdout.write("\033[H\033[2J")
+        sys.stdout.flush()
     
     def display_main_menu(self):
-        print("--- Employee Management Menu ---")
-        print("1. Create employee")
-        print("2. View employees")
-        print("3. Grant vacation to an employee")
-        print("4. Pay employees")
-        print("5. View employee history")
-        print("6. Exit")
+        print(self._MAIN_MENU)
+    
+    def _prompt_int(self, prompt: str, low: int, high: int) -> Optional[int]:
+        "Pide un entero entre low y high; devuelve None si la entrada no es válida"
+        try:
+            number = int(input(prompt))
+        except ValueError:
+            number = None
+        if number is not None and low <= number <= high:
+            return number
+        print("Invalid option.")
+        return None
     
     def create_employee_menu(self):
         try:
             name = input("Employee name: ")
             
             print("Available roles:")
-            for i, role in enumerate(EmployeeRole, 1):
+            for i, role in enumerate(self._ROLES, 1):
                 print(f"{i}. {role.value}")
-            role_choice = int(input("Select role: "))
-            role = list(EmployeeRole)[role_choice - 1]
+            role_choice = self._prompt_int("Select role: ", 1, len(self._ROLES))
+            if role_choice is None:
+                return
+            role = self._ROLES[role_choice - 1]
             
             print("Available types:")
-            for i, emp_type in enumerate(EmployeeType, 1):
+            for i, emp_type in enumerate(self._TYPES, 1):
                 print(f"{i}. {emp_type.value}")
-            type_choice = int(input("Select type: "))
-            emp_type = list(EmployeeType)[type_choice - 1]
+            type_choice = self._prompt_int("Select type: ", 1, len(self._TYPES))
+            if type_choice is None:
+                return
+            emp_type = self._TYPES[type_choice - 1]
             
             kwargs = {}
             if emp_type == EmployeeType.SALARIED:
@@ -595,12 +778,7 @@ class EmployeeManagementUI:
     def view_employees_menu(self):
         while True:
             self.clear_screen()
-            print("--- View Employees Submenu ---")
-            print("1. View managers")
-            print("2. View interns") 
-            print("3. View vice presidents")
-            print("4. View all employees")
-            print("0. Return to main menu")
+            print(self._VIEW_EMPLOYEES_MENU)
             
             choice = input("Select an option: ")
             
@@ -628,8 +806,10 @@ class EmployeeManagementUI:
             print("No employees found.")
             return
         
-        for emp in employees:
-            print(f"{emp.name} ({emp.role.value}, {emp.employee_type.value}) - {emp.vacation_days} vacation days")
+        print("\n".join(
+            f"{emp.name} ({emp.role.value}, {emp.employee_type.value}) - {emp.vacation_days} vacation days"
+            for emp in employees
+        ))
     
     def vacation_menu(self):
         if not self.company.employees:
@@ -640,8 +820,11 @@ class EmployeeManagementUI:
         for idx, emp in enumerate(self.company.employees):
             print(f"{idx}. {emp.name} ({emp.role.value}) - {emp.vacation_days} vacation days")
         
+        idx = self._prompt_int("Select employee index: ", 0, len(self.company.employees) - 1)
+        if idx is None:
+            return
+        
         try:
-            idx = int(input("Select employee index: "))
             employee = self.company.employees[idx]
             payout = input("Payout instead of time off? (y/n): ").lower() == "y"
 
@@ -671,8 +854,11 @@ class EmployeeManagementUI:
         for idx, emp in enumerate(self.company.employees):
             print(f"{idx}. {emp.name}")
         
+        idx = self._prompt_int("Select employee index: ", 0, len(self.company.employees) - 1)
+        if idx is None:
+            return
+        
         try:
-            idx = int(input("Select employee index: "))
             employee = self.company.employees[idx]
             history = self.company.get_employee_history(employee.name)
             
@@ -681,7 +867,8 @@ class EmployeeManagementUI:
                 print("No transactions found.")
                 return
             
-            for transaction in sorted(history, key=lambda x: x.date, reverse=True):
+            # El historial se guarda en orden de registro; se recorre del más reciente al más antiguo
+            for transaction in reversed(history):
                 print(f"{transaction.date.strftime('%Y-%m-%d %H:%M')} - "
                       f"{transaction.transaction_type.value}: {transaction.description}")
                 